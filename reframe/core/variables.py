@@ -403,7 +403,7 @@ class TestVar:
 
     def __setattr__(self, name, value):
         '''Set any additional variable attribute into the default value.'''
-        if name in self.__slots__ or name in self.__mutable_props:
+        if name in TestVar.__slots__ or name in self.__mutable_props:
             super().__setattr__(name, value)
         else:
             setattr(self._default_value, name, value)
@@ -778,13 +778,17 @@ class ShadowVar(TestVar):
 
     '''
 
+    # Do not reintroduce a per-instance `__dict__`; all the state is kept in
+    # the slots of `TestVar`
+    __slots__ = ()
+
     def __init__(self, other, alias=None, warnings=True):
         if alias and not isinstance(alias, ShadowVar):
             raise TypeError(
                 'a ShadowVar can only be an alias of another ShadowVar'
             )
 
-        for name in self.__slots__:
+        for name in TestVar.__slots__:
             val = getattr(other, name)
             if name == '_p_default_value':
                 if alias is not None:
@@ -829,9 +833,10 @@ class VarSpace(namespaces.Namespace):
         :param other: instance of the VarSpace class.
         :param cls: the target class.
         '''
+        variables = self.vars
         for key, var in other.items():
-            if key in self.vars:
-                this_var = self.vars[key]
+            if key in variables:
+                this_var = variables[key]
                 if this_var.is_mergeable():
                     this_var.update_from(var)
                 else:
@@ -840,13 +845,21 @@ class VarSpace(namespaces.Namespace):
                         f'{key!r}; consider declaring it with a `merge_func`'
                     )
             else:
-                self.vars[key] = copy.deepcopy(var)
+                # Fields are not modified after their construction, so the
+                # copy can share the field of the original variable, as
+                # shadow variables do. Deprecated fields are an exception,
+                # since their target is reset for aliases below.
+                memo = {}
+                if not var.is_deprecated():
+                    memo[id(var._p_field)] = var._p_field
+
+                variables[key] = copy.deepcopy(var, memo)
 
         # Inherited variables are copied in the current namespace, so we need
         # to update any aliases to point to the current namespace copies
-        for var in self.vars.values():
+        for var in variables.values():
             if var.is_alias():
-                var.reset_target(self.vars[var.target.name])
+                var.reset_target(variables[var.target.name])
 
         # Carry over the set of injected variables
         self._injected_vars.update(other._injected_vars)
@@ -863,42 +876,40 @@ class VarSpace(namespaces.Namespace):
         of these actions on the same var for the same local var space
         is disallowed.
         '''
+        variables = self.vars
         local_varspace = getattr(cls, self.local_namespace_name, False)
         for key, var in local_varspace.items():
             if isinstance(var, TestVar):
                 # Disable redeclaring a variable
-                if key in self.vars:
+                if key in variables:
                     raise ReframeSyntaxError(
                         f'cannot redeclare the variable {key!r}'
                     )
 
                 # Add a new var
-                self.vars[key] = var
+                variables[key] = var
 
         local_varspace.clear()
 
         # If any previously declared variable was defined in the class body
         # by directly assigning it a value, retrieve this value from the class
-        # namespace and update it into the variable space.
-        _assigned_vars = set()
-        for key, value in cls.__dict__.items():
-            if key in self.vars:
+        # namespace, update it into the variable space and delete it from the
+        # class __dict__; we iterate over a snapshot of the class namespace,
+        # so that we can delete the variables as we go.
+        for key, value in list(cls.__dict__.items()):
+            if key in variables:
                 if isinstance(value, ShadowVar):
-                    self.vars[key] = value
+                    variables[key] = value
                 else:
-                    self.vars[key].define(value)
+                    variables[key].define(value)
 
-                _assigned_vars.add(key)
+                delattr(cls, key)
             elif value is Undefined:
                 # Cannot be set as Undefined if not a variable
                 raise ReframeSyntaxError(
                     f'{key!r} has not been declared as a variable'
                 )
 
-        # Delete the vars from the class __dict__.
-        for key in _assigned_vars:
-            delattr(cls, key)
-
     def sanity(self, cls, illegal_names):
         '''Sanity checks post-creation of the var namespace.
 
@@ -907,10 +918,19 @@ class VarSpace(namespaces.Namespace):
         was injected by this namespace.
         '''
         if illegal_names is None:
-            illegal_names = set(dir(cls))
+            # Same names as `dir(cls)`, but without sorting them into a list
+            illegal_names = {name for c in cls.__mro__ for name in c.__dict__}
+
+        # Find all the clashes at once; names of injected variables are
+        # allowed to clash
+        clashes = ((self._namespace.keys() - self._injected_vars) &
+                   illegal_names)
+        if not clashes:
+            return
 
+        # Report the first clash in declaration order
         for key in self._namespace:
-            if key in illegal_names and key not in self._injected_vars:
+            if key in clashes:
                 raise ReframeSyntaxError(
                     f'{key!r} already defined in class '
                     f'{cls.__qualname__!r}'
@@ -931,20 +951,26 @@ class VarSpace(namespaces.Namespace):
             self._inject(obj, cls)
 
     def _inject(self, obj, cls):
-        for name, var in self.items():
+        obj_dict = obj.__dict__
+        injected_vars = self._injected_vars
+        for name, var in self._namespace.items():
             # Replace the variable with its descriptor
             setattr(cls, name, var.field)
             getattr(cls, name).__set_name__(obj, name)
 
-            # If the var is defined, set its value
-            if var.is_defined():
+            # If the var is defined, set its value; we resolve the value only
+            # once, instead of going through `is_defined()` and then the
+            # `default_value` property, which would check it again.
+            value = var._default_value
+            if value is not Undefined:
                 # Variable's value is already validated and converted,
                 # so we bypass completely the descriptor logic by not calling
-                # `setattr()`
-                obj.__dict__[name] = var.default_value
+                # `setattr()`. The value must be copied to prevent the
+                # instance from modifying the class variable space.
+                obj_dict[name] = copy.deepcopy(value)
 
             # Track the variables that have been injected.
-            self._injected_vars.add(name)
+            injected_vars.add(name)
 
     @property
     def vars(self):
@@ -3,6 +3,9 @@
 #
 # SPDX-License-Identifier: BSD-3-Clause
 
+import collections
+import functools
+import itertools
 import os
 import shutil
 import time
@@ -17,6 +20,33 @@ from reframe.frontend.reporting import format_testcase_from_json
 from reframe.utility import nodelist_abbrev
 
 
+# Status color; any status not listed here is printed in green
+_STATUS_COLORS = {
+    'ABORT': color.YELLOW,
+    'ABORTED': color.YELLOW,
+    'DRY': color.YELLOW,
+    'SKIP': color.YELLOW,
+    'FAIL': color.RED,
+    'FAILED': color.RED,
+    'ERROR': color.RED
+}
+
+# Statuses that advance the progress counter
+_PROGRESS_STATUSES = frozenset({'ABORT', 'OK', 'SKIP', 'FAIL'})
+
+_JUSTIFY_FUNCS = {
+    'center': str.center,
+    'right': str.rjust
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _colorize_status(status, status_color):
+    # There are only a few distinct justified status strings, so we cache
+    # their colored versions
+    return color.colorize(status, status_color)
+
+
 class PrettyPrinter:
     '''Pretty printing facility for the framework.
 
@@ -37,6 +67,7 @@ class PrettyPrinter:
     def reset_progress(self, total_cases):
         self._progress_count = 0
         self._progress_total = total_cases
+        self._progress_width = len(str(total_cases))
 
     def separator(self, linestyle, msg=''):
         if linestyle == 'short double line':
@@ -49,29 +80,22 @@ class PrettyPrinter:
         self.info('[%s] %s' % (line, msg))
 
     def status(self, status, message='', just=None, level=logging.INFO):
-        if just == 'center':
-            status = status.center(self.status_width - 2)
-        elif just == 'right':
-            status = status.rjust(self.status_width - 2)
-        else:
-            status = status.ljust(self.status_width - 2)
-
+        justify = _JUSTIFY_FUNCS.get(just, str.ljust)
+        status = justify(status, self.status_width - 2)
         status_stripped = status.strip()
         if self.colorize:
-            if status_stripped in ('ABORT', 'ABORTED', 'DRY', 'SKIP'):
-                status = color.colorize(status, color.YELLOW)
-            elif status_stripped in ('FAIL', 'FAILED', 'ERROR'):
-                status = color.colorize(status, color.RED)
-            else:
-                status = color.colorize(status, color.GREEN)
+            status = _colorize_status(
+                status, _STATUS_COLORS.get(status_stripped, color.GREEN)
+            )
 
         final_msg = f'[ {status} ] '
-        if status_stripped in ('ABORT', 'OK', 'SKIP', 'FAIL'):
+        if status_stripped in _PROGRESS_STATUSES:
             if self._progress_count < self._progress_total:
                 self._progress_count += 1
 
-            width = len(str(self._progress_total))
-            padded_progress = str(self._progress_count).rjust(width)
+            padded_progress = str(self._progress_count).rjust(
+                self._progress_width
+            )
             final_msg += f'({padded_progress}/{self._progress_total}) '
 
         final_msg += message
@@ -99,6 +123,10 @@ class PrettyPrinter:
     def failure_report(self, report, rerun_info=True, global_stats=False):
         '''Print a failure report'''
 
+        info, verbose = self.info, self.verbose
+        line_width = min(80, shutil.get_terminal_size()[0])
+        hline = line_width * '-'
+
         def _head_n(filename, prefix, num_lines=10):
             # filename and prefix are `None` before setup
             if filename is None or prefix is None:
@@ -109,10 +137,9 @@ class PrettyPrinter:
                     lines = [
                         f'--- {filename} (first {num_lines} lines) ---'
                     ]
-                    for i, line in enumerate(fp):
-                        if i < num_lines:
-                            # Remove trailing '\n'
-                            lines.append(line.rstrip())
+                    # Remove trailing '\n'
+                    lines += (line.rstrip()
+                              for line in itertools.islice(fp, num_lines))
 
                 lines += [f'--- {filename} ---']
             except OSError as e:
@@ -120,74 +147,81 @@ class PrettyPrinter:
 
             return lines
 
-        def _print_failure_info(rec, runid, total_runs):
-            self.info(line_width * '-')
-            self.info(f"FAILURE INFO for {rec['name']} "
-                      f"(run: {runid}/{total_runs})")
-            self.info(f"  * Description: {rec['descr']}")
-            self.info(f"  * System partition: {rec['system']}")
-            self.info(f"  * Environment: {rec['environ']}")
-            self.info(f"  * Stage directory: {rec['stagedir']}")
-            self.info(f"  * Node list: "
-                      f"{nodelist_abbrev(rec['job_nodelist'])}")
+        def _print_failure_info(rec, runid, total_runs,
+                                info=info, verbose=verbose, hline=hline):
             job_type = 'local' if rec['scheduler'] == 'local' else 'batch job'
-            self.info(f"  * Job type: {job_type} (id={rec['jobid']})")
-            self.info(f"  * Dependencies (conceptual): "
-                      f"{rec['dependencies_conceptual']}")
-            self.info(f"  * Dependencies (actual): "
-                      f"{rec['dependencies_actual']}")
-            self.info(f"  * Maintainers: {rec['maintainers']}")
-            self.info(f"  * Failing phase: {rec['fail_phase']}")
+            lines = [
+                hline,
+                f"FAILURE INFO for {rec['name']} (run: {runid}/{total_runs})",
+                f"  * Description: {rec['descr']}",
+                f"  * System partition: {rec['system']}",
+                f"  * Environment: {rec['environ']}",
+                f"  * Stage directory: {rec['stagedir']}",
+                f"  * Node list: {nodelist_abbrev(rec['job_nodelist'])}",
+                f"  * Job type: {job_type} (id={rec['jobid']})",
+                f"  * Dependencies (conceptual): "
+                f"{rec['dependencies_conceptual']}",
+                f"  * Dependencies (actual): {rec['dependencies_actual']}",
+                f"  * Maintainers: {rec['maintainers']}",
+                f"  * Failing phase: {rec['fail_phase']}"
+            ]
             if rerun_info and not rec['fixture']:
-                self.info(f"  * Rerun with '-n /{rec['hashcode']}"
-                          f" -p {rec['environ']} --system "
-                          f"{rec['system']} -r'")
+                lines.append(f"  * Rerun with '-n /{rec['hashcode']}"
+                             f" -p {rec['environ']} --system "
+                             f"{rec['system']} -r'")
 
-            msg = rec['fail_reason']
-            if isinstance(rec['fail_info']['exc_value'], SanityError):
-                lines = [msg]
+            fail_info = rec['fail_info']
+            lines.append(f"  * Reason: {rec['fail_reason']}")
+            if isinstance(fail_info['exc_value'], SanityError):
                 lines += _head_n(rec['job_stdout'], prefix=rec['stagedir'])
                 lines += _head_n(rec['job_stderr'], prefix=rec['stagedir'])
-                msg = '\n'.join(lines)
-
-            self.info(f"  * Reason: {msg}")
 
-            tb = ''.join(traceback.format_exception(
-                *rec['fail_info'].values()))
+            tb = ''.join(traceback.format_exception(fail_info['exc_type'],
+                                                    fail_info['exc_value'],
+                                                    fail_info['traceback']))
             if rec['fail_severe']:
-                self.info(tb)
+                # Severe failures print the traceback along with the rest
+                lines.append(tb)
+                info('\n'.join(lines))
             else:
-                self.verbose(tb)
+                info('\n'.join(lines))
+                verbose(tb)
 
-        line_width = min(80, shutil.get_terminal_size()[0])
-        self.info(' SUMMARY OF FAILURES '.center(line_width, '='))
+        info(' SUMMARY OF FAILURES '.center(line_width, '='))
 
+        num_runs = len(report['runs'])
         for run_no, run_info in enumerate(report['runs'], start=1):
-            if not global_stats and run_no != len(report['runs']):
+            if not global_stats and run_no != num_runs:
+                continue
+
+            # Do not go through the test cases of runs without failures
+            if not run_info['num_failures']:
                 continue
 
             for r in run_info['testcases']:
                 if r['result'] in {'pass', 'abort', 'skip'}:
                     continue
 
-                _print_failure_info(r, run_no, len(report['runs']))
+                _print_failure_info(r, run_no, num_runs)
 
-        self.info(line_width * '-')
+        info(hline)
 
     def failure_stats(self, report, global_stats=False):
         current_run = rt.runtime().current_run
-        failures = {}
+        failures = collections.defaultdict(list)
+        num_failures = 0
         for runid, run_data in enumerate(report['runs']):
             if not global_stats and runid != current_run:
                 continue
 
             for tc in run_data['testcases']:
+                if tc['result'] in {'pass', 'abort', 'skip'}:
+                    continue
+
                 info = f'{tc["display_name"]}'
                 info += f' @{tc["system"]}:{tc["partition"]}+{tc["environ"]}'
-
-                failed_stage = tc['fail_phase']
-                failures.setdefault(failed_stage, [])
-                failures[failed_stage].append(info)
+                failures[tc['fail_phase']].append(info)
+                num_failures += 1
 
         line_width = shutil.get_terminal_size()[0]
         stats_start = line_width * '='
@@ -202,10 +236,6 @@ class PrettyPrinter:
         else:
             num_tests = report['runs'][current_run]['num_cases']
 
-        num_failures = 0
-        for fl in failures.values():
-            num_failures += len(fl)
-
         stats_body = ['']
         stats_body.append(f'Total number of test cases: {num_tests}')
         stats_body.append(f'Total number of failures: {num_failures}')
@@ -218,8 +248,8 @@ class PrettyPrinter:
                 stats_body.append(row_format.format('', '', str(f)))
 
         if stats_body:
-            for line in (stats_start, stats_title, *stats_body, stats_end):
-                self.info(line)
+            self.info('\n'.join([stats_start, stats_title,
+                                 *stats_body, stats_end]))
 
     def retry_report(self, report):
         '''Print a report for test retries'''
@@ -236,28 +266,35 @@ class PrettyPrinter:
         for run in reversed(report['runs'][1:]):
             runidx = run['run_index']
             for tc in run['testcases']:
-                # Overwrite entry from previous run if available
+                # Keep only the entry of the latest run of each test case;
+                # runs are visited in reverse, so skip those already seen
+                key = (tc['name'], tc['system'],
+                       tc['partition'], tc['environ'])
+                if key in retried_tc:
+                    continue
+
+                retried_tc.add(key)
                 tc_info = format_testcase_from_json(tc)
-                if tc_info not in retried_tc:
-                    lines.append(
-                        f"  * Test {tc_info} was retried {runidx} time(s) and "
-                        f" {'failed' if tc['result'] == 'fail' else 'passed'}."
-                    )
-                    retried_tc.add(tc_info)
+                lines.append(
+                    f"  * Test {tc_info} was retried {runidx} time(s) and "
+                    f" {'failed' if tc['result'] == 'fail' else 'passed'}."
+                )
 
         self.info('\n'.join(lines))
 
     def performance_report(self, data, **kwargs):
+        info = self.info
         width = min(80, shutil.get_terminal_size()[0])
-        self.info('')
-        self.info(' PERFORMANCE REPORT '.center(width, '='))
-        self.info('')
+        info('')
+        info(' PERFORMANCE REPORT '.center(width, '='))
+        info('')
         self.table(data, **kwargs)
-        self.info('')
+        info('')
 
     def _table_as_csv(self, data):
+        info = self.info
         for line in data:
-            self.info(','.join(str(x) for x in line))
+            info(','.join(str(x) for x in line))
 
     def table(self, data, **kwargs):
         '''Print tabular data'''
@@ -283,14 +320,12 @@ class PrettyPrinter:
             colidx = [i for i, col in enumerate(data[0])
                       if col not in hide_columns]
 
-            def _access(seq, i, default=None):
-                # Safe access of i-th element of a sequence
-                try:
-                    return seq[i]
-                except IndexError:
-                    return default
-
-            tab_data = [[_access(rec, col) for col in colidx] for rec in data]
+            # Records may be shorter than the header; fill in with `None`
+            tab_data = []
+            for rec in data:
+                reclen = len(rec)
+                tab_data.append([rec[col] if col < reclen else None
+                                 for col in colidx])
         else:
             tab_data = data
 
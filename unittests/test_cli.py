@@ -930,6 +930,21 @@ def test_failure_stats(run_reframe, run_action):
         assert r'sanity        1     SanityFailureCheck' in stdout
 
 
+def test_failure_stats_passing_tests(run_reframe):
+    returncode, stdout, stderr = run_reframe(
+        checkpath=['unittests/resources/checks/frontend_checks.py',
+                   'unittests/resources/checks/hellocheck.py'],
+        more_options=['-n', '^SanityFailureCheck$|^HelloTest$',
+                      '--failure-stats']
+    )
+    assert 'Traceback' not in stdout
+    assert 'Traceback' not in stderr
+    assert returncode != 0
+    assert 'Total number of test cases: 2' in stdout
+    assert 'Total number of failures: 1' in stdout
+    assert 'HelloTest @' not in stdout
+
+
 def test_maxfail_option(run_reframe):
     returncode, stdout, stderr = run_reframe(
         more_options=['--maxfail', '1'],
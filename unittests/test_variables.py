@@ -278,6 +278,31 @@ def test_upstream_var_fetching():
     assert Bar().v1 == 20
 
 
+def test_upstream_var_has_no_dict():
+    class Foo(rfm.RegressionTest):
+        v0 = variable(int, value=10)
+
+    class Bar(Foo):
+        # Fetching `v0` in the class body creates a shadow variable
+        assert not hasattr(v0, '__dict__')
+        v0 = 20
+
+    assert Bar().v0 == 20
+
+
+def test_inherited_var_shares_field():
+    class Foo(rfm.RegressionTest):
+        v0 = variable(int, value=10)
+
+    class Bar(Foo):
+        pass
+
+    foo_var = Foo._rfm_var_space['v0']
+    bar_var = Bar._rfm_var_space['v0']
+    assert bar_var is not foo_var
+    assert bar_var.field is foo_var.field
+
+
 def test_var_basic_operators():
     class A(rfm.RegressionTest):
         v = variable(int, value=2)